@@ -3,34 +3,242 @@ myuzePlay Search API using Pinecone
 FREE Version - Using Sentence Transformers
 """
 
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from quart import Quart, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
 from sentence_transformers import SentenceTransformer
-from pinecone import Pinecone
+from pinecone import AsyncPinecone
+from cachetools import LRUCache, TTLCache
+from concurrent.futures import Future
+from logging.handlers import QueueHandler, QueueListener
+from pythonjsonlogger.json import JsonFormatter
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import orjson
 import os
+import queue
+import sys
+import threading
+import time
+import torch
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for GPT access
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider using orjson for fast response serialization"""
+    option = orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+class EmbeddingBatcher:
+    """Collects queries arriving close together and encodes them as one batch
+    
+    A single background thread owns the model: it waits for the first query,
+    gathers more for up to max_wait seconds (or max_batch_size queries), runs
+    one encode() and resolves each caller's Future with its vector.
+    """
+
+    def __init__(self, max_batch_size=32, max_wait=0.005):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, text):
+        """Queue a text for encoding; the Future resolves to a list of floats"""
+        future = Future()
+        self.queue.put((text, future))
+        return future
+
+    def _collect(self):
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # Drop entries whose caller already gave up (cancelled Future)
+            batch = [
+                (text, future) for text, future in self._collect()
+                if future.set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = encode(
+                    texts,
+                    batch_size=len(texts),
+                    convert_to_numpy=True
+                ).tolist()
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), embedding in zip(batch, embeddings):
+                    future.set_result(embedding)
+
+app = Quart(__name__)
+app.json = OrjsonProvider(app)
+# Enable CORS for GPT access; expose ETag so browsers can send If-None-Match
+app = cors(app, allow_origin="*", expose_headers=["ETag"])
 
 # Configuration
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 INDEX_NAME = "myuze-content"
+PINECONE_POOL_MAXSIZE = int(os.getenv("PINECONE_POOL_MAXSIZE", 100))
+
+# Embedding model: int8-quantized ONNX export by default, "torch" for FP32 PyTorch
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "onnx")
+ONNX_MODEL_FILE = os.getenv("ONNX_MODEL_FILE", "onnx/model_quint8_avx2.onnx")
+# Weight precision for the torch backend: half on GPU, "bfloat16" suits CPUs with AVX-512 BF16/AMX
+EMBEDDING_DTYPE = os.getenv("EMBEDDING_DTYPE", "float16" if torch.cuda.is_available() else "float32")
+# Token cap for queries (the model default is 256); search queries are short
+EMBEDDING_MAX_SEQ_LENGTH = int(os.getenv("EMBEDDING_MAX_SEQ_LENGTH", 64))
+
+# Metadata fields copied into search results and bucket items
+RESULT_FIELDS = (
+    'podcast_id', 'title', 'description', 'ptype', 'category',
+    'is_billable', 'episode_count', 'ADDED_ON', 'updated_at'
+)
+RESULT_LIST_FIELDS = ('language', 'category_levels', 'zoneid')
+BUCKET_ITEM_FIELDS = ('podcast_id', 'title', 'ptype', 'language', 'category')
+
+# Cache settings
+EMBEDDING_CACHE_SIZE = 10000
+RESULT_CACHE_MATCHES = 20000  # total matches held across cached results
+RESULT_CACHE_TTL = 60  # seconds
+STATS_CACHE_TTL = 5  # seconds
+EMBEDDING_BATCH_SIZE = 32
+EMBEDDING_BATCH_WAIT = 0.005  # seconds to gather a batch
+EMBEDDING_TIMEOUT = 2.0  # seconds a request waits for its vector
+INITIAL_TOP_K = 20  # first-page size for semantic search
+RESPONSE_CACHE_BYTES = 64 * 1024 * 1024  # total size of cached response bodies
+RESPONSE_CACHE_TTL = 120  # seconds
+MAX_TOP_K = 100  # upper bound on client-supplied top_k / bucket_size
+
+# Inference settings (torch backend only; unset keeps torch's physical-core default)
+TORCH_NUM_THREADS = os.getenv("TORCH_NUM_THREADS")
+
+# Logging: request threads only enqueue records; a background listener
+# formats them as JSON and writes to stdout
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+log_queue = queue.Queue()
+log_handler = logging.StreamHandler(sys.stdout)
+log_handler.setFormatter(JsonFormatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+log_listener = QueueListener(log_queue, log_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger = logging.getLogger("myuze")
+logger.setLevel(LOG_LEVEL)
+logger.addHandler(QueueHandler(log_queue))
+logger.propagate = False
 
 # Initialize clients
-print("🔧 Initializing Pinecone...")
-pc = Pinecone(api_key=PINECONE_API_KEY)
-index = pc.Index(INDEX_NAME)
+# The async Pinecone client is bound to the serving event loop, so it is
+# opened in open_pinecone() once the server starts (see PINECONE CLIENT)
+pc = None
+index = None
+
+logger.info("Loading embedding model %s (%s backend)", EMBEDDING_MODEL, EMBEDDING_BACKEND)
+if EMBEDDING_BACKEND == "onnx":
+    embedding_model = SentenceTransformer(
+        EMBEDDING_MODEL,
+        backend="onnx",
+        model_kwargs={"file_name": ONNX_MODEL_FILE}
+    )
+else:
+    embedding_model = SentenceTransformer(
+        EMBEDDING_MODEL,
+        model_kwargs={"torch_dtype": getattr(torch, EMBEDDING_DTYPE)}
+    )
+
+# encode() already pads each batch only to its longest query and mean-pools
+# over the attention mask; capping the length bounds that longest query
+embedding_model.max_seq_length = EMBEDDING_MAX_SEQ_LENGTH
+
+if TORCH_NUM_THREADS:
+    torch.set_num_threads(int(TORCH_NUM_THREADS))
+embedding_model.eval()
+
+# Request-time encodes go through the batcher's single worker thread
+embedding_batcher = EmbeddingBatcher(
+    max_batch_size=EMBEDDING_BATCH_SIZE,
+    max_wait=EMBEDDING_BATCH_WAIT
+)
+
+# Caches are only touched from the event loop, so they need no locks
+# Query embeddings for repeated queries
+embedding_cache = LRUCache(maxsize=EMBEDDING_CACHE_SIZE)
 
-print("🤖 Loading embedding model...")
-embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-print("✅ API Ready!\n")
+# Pinecone results for repeated queries, keyed by (query, filter, top_k);
+# sized by match count since each match carries its full metadata
+result_cache = TTLCache(
+    maxsize=RESULT_CACHE_MATCHES,
+    ttl=RESULT_CACHE_TTL,
+    getsizeof=lambda results: max(1, len(results.matches))
+)
+
+# Serialized search responses as (body, etag), keyed by a hash of the
+# search parameters and sized by body bytes
+response_cache = TTLCache(
+    maxsize=RESPONSE_CACHE_BYTES,
+    ttl=RESPONSE_CACHE_TTL,
+    getsizeof=lambda entry: len(entry[0])
+)
+
+# Index stats for /health
+stats_cache = TTLCache(maxsize=1, ttl=STATS_CACHE_TTL)
+
+# ========================================
+# PINECONE CLIENT
+# ========================================
+
+@app.before_serving
+async def open_pinecone():
+    """Open one async client and index per worker; the index keeps its own
+    connection pool of PINECONE_POOL_MAXSIZE"""
+    global pc, index
+    logger.info("Initializing Pinecone")
+    pc = AsyncPinecone(api_key=PINECONE_API_KEY, connection_pool_maxsize=PINECONE_POOL_MAXSIZE)
+    index = await pc.index(name=INDEX_NAME)
+
+@app.after_serving
+async def close_pinecone():
+    """Release Pinecone connections on shutdown"""
+    # Either may be unset if open_pinecone() failed; don't mask that error
+    if index is not None:
+        await index.close()
+    if pc is not None:
+        await pc.close()
 
 # ========================================
 # SEMANTIC SEARCH ENDPOINT
 # ========================================
 
 @app.route('/v1/search/semantic', methods=['POST'])
-def semantic_search():
+async def semantic_search():
     """
     Semantic search endpoint
     
@@ -47,59 +255,64 @@ def semantic_search():
     }
     """
     try:
-        data = request.json
+        data = await request.get_json()
         
         # Extract parameters
         query = data.get('query', '')
         filters = data.get('filters', {})
-        top_k = data.get('top_k', 50)
+        top_k = clamp_top_k(data.get('top_k', 50))
         score_threshold = data.get('score_threshold', 0.7)
         
         if not query:
             return jsonify({"error": "Query is required"}), 400
         
-        print(f"🔍 Search query: {query}")
+        # Identical searches reuse the serialized response (or get a 304)
+        cache_key = hashlib.blake2b(
+            orjson.dumps(
+                [query, filters, top_k, score_threshold],
+                option=orjson.OPT_SORT_KEYS
+            ),
+            digest_size=16
+        ).hexdigest()
+        cached_response = response_cache.get(cache_key)
+        if cached_response is not None:
+            return etag_response(*cached_response)
         
-        # Create query embedding (FREE!)
-        query_embedding = embedding_model.encode(query).tolist()
+        logger.debug("Search query: %s", query)
         
         # Build Pinecone filter
         pinecone_filter = build_filter(filters)
         
-        # Search
-        results = index.query(
-            vector=query_embedding,
-            filter=pinecone_filter,
-            top_k=top_k,
-            include_metadata=True
-        )
+        # Search (embedding and results are cached for repeated queries).
+        # Fetch a smaller page first and only ask for the full top_k when
+        # every match on it clears the threshold, so fewer rich metadata
+        # payloads cross the wire when most of them would be discarded.
+        initial_top_k = min(top_k, INITIAL_TOP_K)
+        # Skip result_cache here: the response cache already covers repeats,
+        # and stacking the two TTLs would serve results older than either
+        results = await search_index(query, pinecone_filter, initial_top_k, use_cache=False)
+        matches = results.matches
+        if (top_k > initial_top_k and len(matches) == initial_top_k
+                and matches[-1].score >= score_threshold):
+            results = await search_index(query, pinecone_filter, top_k, use_cache=False)
         
         # Format results
         formatted_results = []
         for match in results.matches:
-            if match.score >= score_threshold:
-                metadata = match.metadata
-                
-                # Parse comma-separated fields back to arrays
-                item = {
-                    "podcast_id": metadata.get('podcast_id'),
-                    "score": float(match.score),
-                    "title": metadata.get('title'),
-                    "description": metadata.get('description'),
-                    "ptype": metadata.get('ptype'),
-                    "language": metadata.get('language', '').split(',') if metadata.get('language') else [],
-                    "category": metadata.get('category'),
-                    "category_levels": metadata.get('category_levels', '').split(',') if metadata.get('category_levels') else [],
-                    "zoneid": metadata.get('zoneid', '').split(',') if metadata.get('zoneid') else [],
-                    "is_billable": metadata.get('is_billable'),
-                    "episode_count": metadata.get('episode_count'),
-                    "ADDED_ON": metadata.get('ADDED_ON'),
-                    "updated_at": metadata.get('updated_at')
-                }
-                
-                formatted_results.append(item)
+            # Matches come back sorted by descending score
+            if match.score < score_threshold:
+                break
+            
+            get = match.metadata.get
+            item = {field: get(field) for field in RESULT_FIELDS}
+            item["score"] = match.score
+            # List fields are stored as list metadata (legacy rows as CSV strings)
+            for field in RESULT_LIST_FIELDS:
+                item[field] = as_list(get(field))
+            
+            formatted_results.append(item)
         
-        print(f"✅ Found {len(formatted_results)} results")
+        logger.debug("Found %d results", len(formatted_results))
         
         response = {
             "query": query,
@@ -108,10 +321,14 @@ def semantic_search():
             "results": formatted_results
         }
         
-        return jsonify(response), 200
+        body = await app.json.response(response).get_data()
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        response_cache[cache_key] = (body, etag)
+        
+        return etag_response(body, etag)
     
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        logger.exception("Request failed: %s", e)
         return jsonify({"error": str(e)}), 500
 
 # ========================================
@@ -119,7 +336,7 @@ def semantic_search():
 # ========================================
 
 @app.route('/v1/buckets/generate', methods=['POST'])
-def generate_buckets():
+async def generate_buckets():
     """
     AI-powered bucket generation
     
@@ -131,51 +348,24 @@ def generate_buckets():
     }
     """
     try:
-        data = request.json
+        data = await request.get_json()
         country = data.get('country', 'IN')
         num_buckets = data.get('num_buckets', 5)
-        bucket_size = data.get('bucket_size', 15)
+        bucket_size = clamp_top_k(data.get('bucket_size', 15))
         
-        print(f"🪣 Generating {num_buckets} buckets for {country}")
+        logger.debug("Generating %s buckets for %s", num_buckets, country)
         
         # Predefined bucket queries by market
-        bucket_templates = get_bucket_templates(country)
+        market = country if country in BUCKET_TEMPLATES else DEFAULT_BUCKET_COUNTRY
+        bucket_templates = get_bucket_templates(market)[:num_buckets]
+        # Template embeddings were precomputed at startup
+        embeddings = [TEMPLATE_EMBEDDINGS[(market, t['name'])] for t in bucket_templates]
         
-        buckets = []
-        
-        for template in bucket_templates[:num_buckets]:
-            # Search for bucket contents (FREE embedding!)
-            query_embedding = embedding_model.encode(template['query']).tolist()
-            
-            results = index.query(
-                vector=query_embedding,
-                filter=template.get('filter'),
-                top_k=bucket_size,
-                include_metadata=True
-            )
-            
-            # Format bucket
-            bucket = {
-                "bucket_name": template['name'],
-                "bucket_type": template['type'],
-                "reasoning": template['reasoning'],
-                "total_items": len(results.matches),
-                "items": []
-            }
-            
-            for match in results.matches:
-                metadata = match.metadata
-                bucket['items'].append({
-                    "podcast_id": metadata.get('podcast_id'),
-                    "title": metadata.get('title'),
-                    "ptype": metadata.get('ptype'),
-                    "language": metadata.get('language'),
-                    "category": metadata.get('category'),
-                    "score": float(match.score)
-                })
-            
-            buckets.append(bucket)
-            print(f"  ✅ {template['name']}: {len(results.matches)} items")
+        # Query Pinecone for all buckets concurrently, keeping template order
+        buckets = await asyncio.gather(*(
+            fetch_bucket(template, query_embedding, bucket_size)
+            for template, query_embedding in zip(bucket_templates, embeddings)
+        ))
         
         return jsonify({
             "country": country,
@@ -183,149 +373,262 @@ def generate_buckets():
         }), 200
     
     except Exception as e:
-        print(f"❌ Error: {str(e)}")
+        logger.exception("Request failed: %s", e)
         return jsonify({"error": str(e)}), 500
 
 # ========================================
 # HELPER FUNCTIONS
 # ========================================
 
+def encode(sentences, **kwargs):
+    """Run the embedding model with autograd disabled (grad mode is per-thread)"""
+    with torch.inference_mode():
+        return embedding_model.encode(sentences, **kwargs)
+
+async def batch_encode(text):
+    """Encode a text on the batcher thread without blocking the event loop"""
+    future = asyncio.wrap_future(embedding_batcher.submit(text))
+    return await asyncio.wait_for(future, EMBEDDING_TIMEOUT)
+
+async def cached_encode(query):
+    """Encode a query, reusing the embedding for repeated queries
+    
+    The Pinecone client JSON-encodes the query vector, so it needs a list;
+    the batcher converts each batch once and the cache keeps the result.
+    """
+    embedding = embedding_cache.get(query)
+    if embedding is None:
+        embedding = await batch_encode(query)
+        embedding_cache[query] = embedding
+    return embedding
+
+async def search_index(query, pinecone_filter=None, top_k=10, vector=None, use_cache=True):
+    """Query Pinecone for a text query, caching results for a short TTL"""
+    key = (query, json.dumps(pinecone_filter, sort_keys=True), top_k)
+    results = result_cache.get(key) if use_cache else None
+    if results is not None:
+        return results
+    
+    if vector is None:
+        vector = await cached_encode(query)
+    
+    results = await index.query(
+        vector=vector,
+        filter=pinecone_filter,
+        top_k=top_k,
+        include_metadata=True
+    )
+    
+    if use_cache:
+        result_cache[key] = results
+    return results
+
+async def fetch_bucket(template, query_embedding, bucket_size):
+    """Search for a bucket template's contents and format the bucket"""
+    results = await search_index(
+        template['query'],
+        template.get('filter'),
+        bucket_size,
+        vector=query_embedding
+    )
+    
+    bucket = {
+        "bucket_name": template['name'],
+        "bucket_type": template['type'],
+        "reasoning": template['reasoning'],
+        "total_items": len(results.matches),
+        "items": []
+    }
+    
+    items = bucket['items']
+    for match in results.matches:
+        get = match.metadata.get
+        item = {field: get(field) for field in BUCKET_ITEM_FIELDS}
+        item["score"] = match.score
+        items.append(item)
+    
+    logger.debug("Bucket %s: %d items", template['name'], len(results.matches))
+    return bucket
+
+def etag_response(body, etag):
+    """JSON response with an ETag, answering 304 if the client's copy matches"""
+    # Search is a POST, which werkzeug's make_conditional() leaves alone
+    if request.if_none_match.contains(etag):
+        response = app.response_class(b'', status=304)
+    else:
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
+
+def clamp_top_k(value):
+    """Bound a client-supplied result count to 1..MAX_TOP_K"""
+    return max(1, min(int(value), MAX_TOP_K))
+
+def as_list(value):
+    """Return list metadata as-is, splitting legacy comma-separated strings"""
+    if isinstance(value, list):
+        return value
+    return value.split(',') if value else []
+
+def _build_ptype(value, out):
+    out['ptype'] = {'$in': value if isinstance(value, list) else [value]}
+
+def _build_country(value, out):
+    # $in matches any element of list metadata
+    out['zoneid'] = {'$in': [value, 'WorldWide']}
+
+def _build_monetization(value, out):
+    out['is_billable'] = {'$in': value if isinstance(value, list) else [value]}
+
+# Request filter name -> builder adding its clause to the Pinecone filter
+FILTER_BUILDERS = {
+    'ptype': _build_ptype,
+    'country': _build_country,
+    'monetization': _build_monetization
+}
+
 def build_filter(filters):
     """Build Pinecone filter from request filters"""
-    pinecone_filter = {}
-    
     if not filters:
         return None
     
-    # Handle ptype filter
-    if 'ptype' in filters:
-        ptypes = filters['ptype']
-        if isinstance(ptypes, list) and len(ptypes) == 1:
-            pinecone_filter['ptype'] = {'$eq': ptypes[0]}
-        elif isinstance(ptypes, list):
-            pinecone_filter['ptype'] = {'$in': ptypes}
-    
-    # Handle country/zoneid filter
-    if 'country' in filters:
-        country = filters['country']
-        # Need to search in comma-separated zoneid string
-        pinecone_filter['$or'] = [
-            {'zoneid': {'$eq': 'WorldWide'}},
-            {'zoneid': {'$eq': country}}
-        ]
-    
-    # Handle is_billable
-    if 'monetization' in filters:
-        monetization = filters['monetization']
-        if isinstance(monetization, list):
-            pinecone_filter['is_billable'] = {'$in': monetization}
+    pinecone_filter = {}
+    for name, value in filters.items():
+        builder = FILTER_BUILDERS.get(name)
+        if builder:
+            builder(value, pinecone_filter)
     
-    return pinecone_filter if pinecone_filter else None
+    return pinecone_filter or None
+
+# Predefined bucket queries by market
+DEFAULT_BUCKET_COUNTRY = 'IN'
+BUCKET_TEMPLATES = {
+    'IN': [
+        {
+            'name': 'Top Hindi Vodacasts',
+            'type': 'Vodacast',
+            'query': 'Hindi Bollywood entertainment celebrity video podcasts India',
+            'filter': {'ptype': {'$eq': 'Vodacast'}},
+            'reasoning': 'Hindi Vodacasts have highest engagement in India market'
+        },
+        {
+            'name': 'Cricket Insider Talk',
+            'type': 'Vodacast',
+            'query': 'Cricket IPL T20 sports analysis commentary India',
+            'filter': {'ptype': {'$eq': 'Vodacast'}},
+            'reasoning': 'Cricket is the most popular sport in India'
+        },
+        {
+            'name': 'Startup Stories India',
+            'type': 'Show',
+            'query': 'Business entrepreneur startup founder success stories India',
+            'filter': {'ptype': {'$eq': 'Show'}},
+            'reasoning': 'Strong startup ecosystem interest'
+        },
+        {
+            'name': 'New Hindi Podcasts',
+            'type': 'Podcast',
+            'query': 'Hindi entertainment news talk podcasts recently added',
+            'filter': {'ptype': {'$eq': 'Podcast'}},
+            'reasoning': 'Recency-driven discovery for Hindi listeners'
+        },
+        {
+            'name': 'Mythology Audiobooks India',
+            'type': 'Book',
+            'query': 'Indian mythology Ramayana Mahabharata Hindu epics audiobooks',
+            'filter': {'ptype': {'$eq': 'Book'}},
+            'reasoning': 'Cultural storytelling interest'
+        },
+        {
+            'name': 'Comedy & Standup Shows',
+            'type': 'Vodacast',
+            'query': 'Hindi comedy standup funny entertainment India',
+            'filter': {'ptype': {'$eq': 'Vodacast'}},
+            'reasoning': 'Growing comedy scene in India'
+        },
+        {
+            'name': 'Technology & Gadgets',
+            'type': 'Show',
+            'query': 'Technology mobile phones gadgets tech reviews India',
+            'filter': {'ptype': {'$eq': 'Show'}},
+            'reasoning': 'High tech adoption market'
+        }
+    ],
+    'PK': [
+        {
+            'name': 'Top Urdu Vodacasts',
+            'type': 'Vodacast',
+            'query': 'Urdu entertainment talk video podcasts Pakistan',
+            'filter': {'ptype': {'$eq': 'Vodacast'}},
+            'reasoning': 'Urdu is primary language in Pakistan'
+        },
+        {
+            'name': 'Cricket Talk Pakistan',
+            'type': 'Podcast',
+            'query': 'Cricket PSL Pakistan sports commentary Urdu',
+            'filter': {'ptype': {'$eq': 'Podcast'}},
+            'reasoning': 'Cricket dominates sports interest'
+        },
+        {
+            'name': 'Islamic Content',
+            'type': 'Podcast',
+            'query': 'Islamic Quran Hadith religious spiritual Pakistan Urdu',
+            'filter': {'ptype': {'$eq': 'Podcast'}},
+            'reasoning': 'Strong religious content interest'
+        }
+    ],
+    'US': [
+        {
+            'name': 'Top English Podcasts',
+            'type': 'Podcast',
+            'query': 'English talk entertainment news podcasts USA',
+            'filter': {'ptype': {'$eq': 'Podcast'}},
+            'reasoning': 'English is primary language'
+        }
+    ]
+}
 
 def get_bucket_templates(country):
     """Get predefined bucket templates by country"""
-    templates = {
-        'IN': [
-            {
-                'name': 'Top Hindi Vodacasts',
-                'type': 'Vodacast',
-                'query': 'Hindi Bollywood entertainment celebrity video podcasts India',
-                'filter': {'ptype': {'$eq': 'Vodacast'}},
-                'reasoning': 'Hindi Vodacasts have highest engagement in India market'
-            },
-            {
-                'name': 'Cricket Insider Talk',
-                'type': 'Vodacast',
-                'query': 'Cricket IPL T20 sports analysis commentary India',
-                'filter': {'ptype': {'$eq': 'Vodacast'}},
-                'reasoning': 'Cricket is the most popular sport in India'
-            },
-            {
-                'name': 'Startup Stories India',
-                'type': 'Show',
-                'query': 'Business entrepreneur startup founder success stories India',
-                'filter': {'ptype': {'$eq': 'Show'}},
-                'reasoning': 'Strong startup ecosystem interest'
-            },
-            {
-                'name': 'New Hindi Podcasts',
-                'type': 'Podcast',
-                'query': 'Hindi entertainment news talk podcasts recently added',
-                'filter': {'ptype': {'$eq': 'Podcast'}},
-                'reasoning': 'Recency-driven discovery for Hindi listeners'
-            },
-            {
-                'name': 'Mythology Audiobooks India',
-                'type': 'Book',
-                'query': 'Indian mythology Ramayana Mahabharata Hindu epics audiobooks',
-                'filter': {'ptype': {'$eq': 'Book'}},
-                'reasoning': 'Cultural storytelling interest'
-            },
-            {
-                'name': 'Comedy & Standup Shows',
-                'type': 'Vodacast',
-                'query': 'Hindi comedy standup funny entertainment India',
-                'filter': {'ptype': {'$eq': 'Vodacast'}},
-                'reasoning': 'Growing comedy scene in India'
-            },
-            {
-                'name': 'Technology & Gadgets',
-                'type': 'Show',
-                'query': 'Technology mobile phones gadgets tech reviews India',
-                'filter': {'ptype': {'$eq': 'Show'}},
-                'reasoning': 'High tech adoption market'
-            }
-        ],
-        'PK': [
-            {
-                'name': 'Top Urdu Vodacasts',
-                'type': 'Vodacast',
-                'query': 'Urdu entertainment talk video podcasts Pakistan',
-                'filter': {'ptype': {'$eq': 'Vodacast'}},
-                'reasoning': 'Urdu is primary language in Pakistan'
-            },
-            {
-                'name': 'Cricket Talk Pakistan',
-                'type': 'Podcast',
-                'query': 'Cricket PSL Pakistan sports commentary Urdu',
-                'filter': {'ptype': {'$eq': 'Podcast'}},
-                'reasoning': 'Cricket dominates sports interest'
-            },
-            {
-                'name': 'Islamic Content',
-                'type': 'Podcast',
-                'query': 'Islamic Quran Hadith religious spiritual Pakistan Urdu',
-                'filter': {'ptype': {'$eq': 'Podcast'}},
-                'reasoning': 'Strong religious content interest'
-            }
-        ],
-        'US': [
-            {
-                'name': 'Top English Podcasts',
-                'type': 'Podcast',
-                'query': 'English talk entertainment news podcasts USA',
-                'filter': {'ptype': {'$eq': 'Podcast'}},
-                'reasoning': 'English is primary language'
-            }
-        ]
-    }
-    
-    return templates.get(country, templates['IN'])
+    return BUCKET_TEMPLATES.get(country, BUCKET_TEMPLATES[DEFAULT_BUCKET_COUNTRY])
+
+def precompute_template_embeddings():
+    """Encode every bucket template query once, keyed by (country, name)"""
+    template_embeddings = {}
+    for country, templates in BUCKET_TEMPLATES.items():
+        embeddings = encode(
+            [t['query'] for t in templates],
+            batch_size=32,
+            convert_to_numpy=True
+        )
+        # One C-level conversion for the whole matrix instead of per row
+        for template, embedding in zip(templates, embeddings.tolist()):
+            template_embeddings[(country, template['name'])] = embedding
+    return template_embeddings
 
 # ========================================
 # HEALTH CHECK
 # ========================================
 
+async def get_index_stats():
+    """Index stats, cached briefly so health probes don't hit Pinecone each time"""
+    stats = stats_cache.get('stats')
+    if stats is None:
+        stats = await index.describe_index_stats()
+        stats_cache['stats'] = stats
+    return stats
+
 @app.route('/health', methods=['GET'])
-def health():
+async def health():
     """Health check endpoint"""
     try:
-        stats = index.describe_index_stats()
+        stats = await get_index_stats()
         return jsonify({
             "status": "healthy",
             "total_vectors": stats.total_vector_count,
             "index_fullness": stats.index_fullness,
-            "embedding_model": "all-MiniLM-L6-v2",
+            "embedding_model": EMBEDDING_MODEL,
+            "embedding_backend": EMBEDDING_BACKEND,
             "cost": "FREE"
         }), 200
     except Exception as e:
@@ -339,18 +642,12 @@ def health():
 # ========================================
 
 @app.route('/test', methods=['GET'])
-def test():
+async def test():
     """Quick test endpoint"""
     try:
         # Test search
         test_query = "Hindi Bollywood entertainment"
-        query_embedding = embedding_model.encode(test_query).tolist()
-        
-        results = index.query(
-            vector=query_embedding,
-            top_k=3,
-            include_metadata=True
-        )
+        results = await search_index(test_query, top_k=3)
         
         return jsonify({
             "test_query": test_query,
@@ -358,13 +655,26 @@ def test():
             "sample_results": [
                 {
                     "title": m.metadata.get('title'),
-                    "score": float(m.score)
+                    "score": m.score
                 } for m in results.matches
             ]
         }), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# ========================================
+# STARTUP
+# ========================================
+
+# Warm up tokenizer and weights so the first request doesn't pay for it
+logger.info("Warming up embedding model")
+encode('warmup')
+encode(['warmup'] * 4, batch_size=4)
+
+logger.info("Precomputing bucket template embeddings")
+TEMPLATE_EMBEDDINGS = precompute_template_embeddings()
+logger.info("API ready")
+
 # ========================================
 # RUN SERVER
 # ========================================
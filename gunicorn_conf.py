@@ -0,0 +1,17 @@
+"""
+Gunicorn configuration for myuzePlay Search API
+Uvicorn (ASGI) workers: each runs the Quart app on one event loop, so
+Pinecone queries from many requests are in flight at the same time
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', 7860)}"
+
+worker_class = 'uvicorn_worker.UvicornWorker'
+# Each worker loads its own embedding model, batcher thread and caches, so
+# default to one; raise WEB_CONCURRENCY only when memory and CPU quota allow
+workers = int(os.getenv('WEB_CONCURRENCY', 1))
+
+timeout = 300
+accesslog = '-'